@@ -15,11 +15,18 @@
 
 import argparse
 import sys
-import re
 from pathlib import Path
 import json
 from datetime import datetime
-import time
+import os
+import shutil
+import tarfile
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from bisect import bisect_left
+from collections import OrderedDict, deque, namedtuple
 
 # --- 전역 설정 ---
 
@@ -40,11 +47,18 @@ try:
         # dfVFS: 디지털 포렌식 가상 파일 시스템. E01 같은 이미지 파일을 쉽게 다루게 해줌.
         from dfvfs.lib import definitions
         from dfvfs.path import factory as path_spec_factory
+        from dfvfs.resolver import context as resolver_context
         from dfvfs.resolver import resolver as path_spec_resolver
 except Exception as e:
     print(f"**FATAL ERROR**: Failed to import dfvfs modules. Reason: {e}", file=sys.stderr)
     IS_MOCK_MODE = True
 
+try:
+    # orjson: 선택 의존성. 설치되어 있으면 artifacts.json 파싱과 JSON 파일(manifest.json 등) 기록에 사용함.
+    import orjson
+except ImportError:
+    orjson = None
+
 # --- UI 및 콘솔 출력을 위한 Rich 라이브러리 설정 ---
 from rich.console import Console
 from rich.table import Table
@@ -61,28 +75,138 @@ if IS_MOCK_MODE:
     console.print("[yellow]Warning[/yellow]: Required forensic libraries not found. Running in [bold]Mock Mode[/bold].")
 
     # 실제 파일 시스템 객체 대신 사용할 가짜 클래스 정의
+    # dfVFS FileEntry와 같은 IsFile()/IsDirectory() 메서드를 제공하여 탐색 코드가 분기 없이 호출할 수 있게 함
     class MockDir:
+        sub_file_entries = () # 하위 항목 없음 (호출마다 새 목록을 만들지 않도록 빈 튜플 공유)
         def __init__(self, name): self.name = name
         def _GetSubFileEntries(self): return []
+        def IsFile(self): return False
         def IsDirectory(self): return True
 
     class MockFile: pass
 
 # --- 함수 정의 ---
 
+def load_json_bytes(raw: bytes):
+    """UTF-8 JSON 바이트를 파싱하는 함수. orjson이 있으면 사용하고, 없으면 표준 json을 사용함."""
+    return orjson.loads(raw) if orjson else json.loads(raw.decode('utf-8'))
+
+
+def dump_json_bytes(obj) -> bytes:
+    """객체를 들여쓰기된 UTF-8 JSON 바이트로 만드는 함수. orjson이 있으면 사용하고, 없으면 표준 json을 사용함."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
 def load_artifact_definitions(file_path="artifacts.json"):
     """아티팩트 경로 정보가 담긴 JSON 파일을 로드하는 함수."""
     try:
         script_dir = Path(__file__).parent
         config_path = script_dir / file_path
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        raw = config_path.read_bytes()
+        definitions = load_json_bytes(raw)
+        return prepare_artifact_definitions(definitions)
     except FileNotFoundError:
         console.print(f"[bold red]FATAL[/bold red]: Artifact definition file not found at '{config_path}'."); sys.exit(1)
     except json.JSONDecodeError:
         console.print(f"[bold red]FATAL[/bold red]: Failed to decode JSON from '{config_path}'."); sys.exit(1)
 
 
+# 탐색·추출에 필요한 아티팩트 정보를 미리 계산해 둔 레코드
+# path_parts: ((경로 조각, 매칭 함수 또는 None), ...)
+# extract_root_upper: 'extract_from'의 마지막 경로 조각(대문자), 결과 폴더의 기준 이름
+# extract_files_upper: 'extract_files' 이름들의 대문자 frozenset (없으면 None)
+ArtifactSpec = namedtuple('ArtifactSpec', 'path_parts extract_root_upper extract_files_upper')
+
+
+def prepare_artifact_definitions(definitions):
+    """로드한 아티팩트 정의마다 ArtifactSpec을 미리 만들어 "_spec"에 저장하는 함수.
+
+    {LLM_NAME} 플레이스홀더가 있는 휴리스틱 정의는 실행 시 이름이 정해지므로 여기서는 건너뜀 (artifact_spec에서 생성).
+    """
+    for categories in definitions.values():
+        for artifacts in categories.values():
+            for artifact_info in artifacts:
+                if "{LLM_NAME}" not in artifact_info["path"] and "{LLM_NAME}" not in artifact_info.get("extract_from", ""):
+                    artifact_info["_spec"] = artifact_spec(artifact_info)
+    return definitions
+
+
+def artifact_spec(artifact_info, llm_name=None):
+    """artifact_info의 ArtifactSpec을 반환하는 함수. 휴리스틱 정의는 llm_name으로 {LLM_NAME}을 치환해 새로 만듦."""
+    spec = artifact_info.get("_spec")
+    if spec is not None:
+        return spec
+    llm_name = (llm_name or "").upper()
+    path_parts = compile_path_parts(artifact_info["path"].replace("{LLM_NAME}", llm_name))
+    extract_root_name = extract_root_upper(artifact_info.get("extract_from", "")).replace("{LLM_NAME}", llm_name)
+    extract_files_upper = None
+    if "extract_files" in artifact_info:
+        extract_files_upper = frozenset(sys.intern(f.upper()) for f in artifact_info["extract_files"])
+    return ArtifactSpec(path_parts, extract_root_name, extract_files_upper)
+
+
+# 경로 구분자 변환 테이블 ('\\' -> '/')
+PATH_SEPARATOR_TABLE = str.maketrans('\\', '/')
+
+
+@lru_cache(maxsize=None)
+def normalize_path(path: str) -> str:
+    """Windows 경로(\\)를 POSIX 경로(//)로 변환하고 드라이브 문자를 제거하는 정규화 함수."""
+    normalized = path.translate(PATH_SEPARATOR_TABLE)
+    # C:/Users/... 같은 경로에서 'C:' 부분을 제거 (첫 '/'보다 앞에 ':'가 있을 때만, 잘라내기 한 번으로 처리)
+    colon = normalized.find(':')
+    if colon >= 0:
+        slash = normalized.find('/')
+        if slash < 0 or colon < slash:
+            normalized = normalized[colon + 1:]
+    return normalized.upper().lstrip('/')
+
+
+@lru_cache(maxsize=None)
+def compile_path_part(part: str):
+    """'CHATGPT*.PF' 같은 부분 와일드카드 경로 조각을 대문자 이름용 매칭 함수로 만드는 함수. 리터럴과 '*' 단독은 None을 반환.
+
+    기존 정규식의 re.match 의미(앞부분 고정, 끝은 열려 있음)를 그대로 따름.
+    정규식 대신 startswith와 find로 '*' 사이의 조각을 왼쪽부터 차례로 찾으므로, 이름 길이에 비례하는 시간 안에 끝남 (역추적 없음).
+    """
+    if '*' not in part or part == '*':
+        return None
+    prefix, *pieces = part.split('*')
+    start = len(prefix)
+    if len(pieces) == 1: # '*'가 하나뿐인 조각(현재 정의의 대부분)
+        suffix = pieces[0]
+        return lambda upper_name: upper_name.startswith(prefix) and upper_name.find(suffix, start) >= 0
+
+    def match_pieces(upper_name):
+        if not upper_name.startswith(prefix):
+            return False
+        position = start
+        for piece in pieces: # 각 조각을 가장 왼쪽에서 찾아야 뒤 조각이 들어갈 자리가 가장 많이 남음
+            position = upper_name.find(piece, position)
+            if position < 0:
+                return False
+            position += len(piece)
+        return True
+    return match_pieces
+
+
+def extract_root_upper(extract_from: str) -> str:
+    """'extract_from' 값에서 결과 폴더의 기준이 될 마지막 경로 조각을 대문자로 구하는 함수."""
+    return extract_from.upper().replace('\\', '/').split('/')[-1]
+
+
+@lru_cache(maxsize=4096)
+def compile_path_parts(path: str):
+    """아티팩트 경로를 정규화해 ((경로 조각, 매칭 함수 또는 None), ...) 튜플로 만드는 함수.
+
+    결과는 캐시되므로 휴리스틱 모드에서 {LLM_NAME}을 치환한 같은 경로는 (경로, LLM 이름) 조합마다 한 번만 분할·컴파일됨.
+    경로 조각은 sys.intern으로 공유하므로, 같은 이름으로 intern된 디렉터리 목록 사전 키와의 비교가 동일성 확인만으로 끝남.
+    """
+    return tuple((sys.intern(part), compile_path_part(part)) for part in normalize_path(path).split('/'))
+
+
 # --- 아티팩트 정보 로드 및 전역 변수 설정 ---
 
 # LLM 종류를 모드별로 매핑
@@ -93,18 +217,59 @@ MODE_MAP = {
 # JSON 파일에서 아티팩트 정보 로드
 LLM_ARTIFACTS = load_artifact_definitions()
 
-
-def normalize_path(path: str) -> str:
-    """Windows 경로(\\)를 POSIX 경로(//)로 변환하고 드라이브 문자를 제거하는 정규화 함수."""
-    normalized = path.replace('\\', '/')
-    # C:/Users/... 같은 경로에서 'C:' 부분을 제거
-    if ':' in normalized and (normalized.find(':') < normalized.find('/') if '/' in normalized else True):
-        normalized = normalized.split(':', 1)[-1]
-    return normalized.upper().lstrip('/')
-
-
-def get_image_root_entry(image_path: Path):
-    """E01 이미지를 열어 Windows OS가 설치된 파티션을 찾아 파일 시스템의 루트를 반환함."""
+# 추출 실패 기록을 구분하는 접두어
+FAILED_PREFIX = "[EXTRACTION_FAILED]"
+
+# 파일 복사 시 한 번에 읽고 쓸 버퍼 크기 (16MB)
+COPY_BUFFER_SIZE = 16 * 1024 * 1024
+# 이 크기 이하의 파일은 한 번의 read/write로 복사 (64KB)
+SMALL_FILE_SIZE = 64 * 1024
+# 이 크기 이상의 파일은 읽기/쓰기를 별도 스레드로 겹쳐서 처리 (청크 크기, 큐 깊이)
+PIPELINE_MIN_SIZE = 32 * 1024 * 1024
+PIPELINE_CHUNK_SIZE = 4 * 1024 * 1024
+PIPELINE_DEPTH = 4
+
+# 이미지별로 찾은 Windows 파티션 위치를 기록하는 캐시 파일 (OUTPUT_DIR 아래에 생성)
+PARTITION_CACHE_FILE = ".partition_cache.json"
+
+# 이미 생성한 결과 디렉터리 경로(문자열) 집합 (같은 디렉터리에 대한 mkdir 시스템 호출 반복 방지)
+CREATED_DIRECTORIES = set()
+
+# 디렉터리 엔트리별 하위 항목 목록 캐시 (최근 사용 순서 기반 LRU, 최대 DIRECTORY_LISTING_CACHE_SIZE개)
+# (키 -> (entry, [(이름, 대문자 이름, 하위 엔트리), ...], {대문자 이름: (이름, 하위 엔트리)}, 정렬 색인 dict))
+# 키는 (스레드 id, dfVFS path_spec.comparable)이며, path_spec이 없으면 id(entry)를 사용함.
+# 엔트리 객체 자체를 함께 보관하므로 캐시에 남아있는 동안 id가 재사용되지 않음.
+DIRECTORY_LISTING_CACHE = OrderedDict()
+DIRECTORY_LISTING_CACHE_SIZE = 4096
+DIRECTORY_LISTING_LOCK = threading.Lock()
+
+# --bundle 옵션 사용 시 카테고리별 tar 묶음 상태
+# BUNDLE_OUTPUT_DIR가 None이 아니면 파일을 개별 생성하지 않고 <카테고리>.tar에 추가함.
+# (카테고리 -> (TarFile, 잠금, {원본 경로: tar 멤버 이름}))
+BUNDLE_OUTPUT_DIR = None
+OPEN_BUNDLES = {}
+OPEN_BUNDLES_LOCK = threading.Lock()
+
+# --copy-threads 옵션 사용 시 파일 복사를 맡는 스레드 풀 상태
+# 탐색 스레드는 복사 작업을 COPY_EXECUTOR에 넘기고 바로 다음 항목을 탐색함.
+# 동시에 대기·진행 중인 복사는 복사 스레드당 COPY_QUEUE_PER_THREAD개로 제한(COPY_SLOTS)하여, 탐색이 복사보다 훨씬 앞서가며
+# dfVFS 엔트리와 경로 문자열을 계속 쌓아 두지 않게 함.
+# (COPY_FUTURES: 제출 순서의 deque[(future, 실패 시 기록할 category_paths)], COPY_CONTEXTS: 복사 스레드별 dfVFS 리졸버 컨텍스트)
+COPY_EXECUTOR = None
+COPY_QUEUE_PER_THREAD = 4
+COPY_SLOTS = None
+COPY_FUTURES = deque()
+COPY_FUTURES_LOCK = threading.Lock()
+COPY_THREAD_STATE = threading.local()
+COPY_CONTEXTS = []
+
+
+def get_image_root_entry(image_path: Path, partition=None, cache_dir=None):
+    """E01 이미지를 열어 Windows OS가 설치된 파티션을 찾아 파일 시스템의 루트를 반환함.
+
+    partition(숫자)을 지정하면 해당 파티션만 확인함. cache_dir을 주면 이전 실행에서 찾은 파티션을
+    PARTITION_CACHE_FILE에서 읽어 먼저 확인하고, 새로 찾은 파티션은 다시 기록함.
+    """
     if IS_MOCK_MODE:
         return MockDir(name='\\'), None
 
@@ -123,10 +288,19 @@ def get_image_root_entry(image_path: Path):
         console.print(f"[bold red]FATAL[/bold red]: Could not initialize base path specs: {e}")
         return None, None
 
-    # EWF 이미지 내 파티션을 p1부터 순서대로 최대 10개까지 확인
-    for i in range(1, 11):
+    # 확인할 파티션 목록: 지정한 파티션만, 또는 이전에 찾은 파티션을 먼저 두고 p1부터 최대 10개까지
+    cached_location = None # 파티션을 지정한 경우에는 캐시를 읽지 않음
+    if partition is not None:
+        partition_locations = [f'/p{partition}']
+    else:
+        partition_locations = [f'/p{i}' for i in range(1, 11)]
+        cached_location = load_cached_partition(cache_dir, image_path)
+        if cached_location in partition_locations:
+            partition_locations.remove(cached_location)
+            partition_locations.insert(0, cached_location)
+
+    for partition_location in partition_locations:
         try:
-            partition_location = f'/p{i}'
             console.print(f"[INFO] Checking partition: [cyan]{partition_location}[/cyan]...")
 
             # 3. TSK 파티션 경로 지정 (예: /p1, /p2)
@@ -147,6 +321,8 @@ def get_image_root_entry(image_path: Path):
             # 'Windows' 폴더 존재 여부로 OS 파티션인지 최종 확인
             if fs_root_entry and fs_root_entry.GetSubFileEntryByName('Windows'):
                 console.print(f"[green][SUCCESS][/green] Found Windows OS at partition: [bold]{partition_location}[/bold]")
+                if partition is None and partition_location != cached_location: # 새로 찾은 경우에만 캐시 갱신
+                    store_cached_partition(cache_dir, image_path, partition_location)
                 return fs_root_entry, ntfs_path_spec
 
         except Exception:
@@ -157,127 +333,642 @@ def get_image_root_entry(image_path: Path):
     console.print("[bold red]FATAL[/bold red]: Could not find a partition containing a 'Windows' directory in the image.")
     return None, None
 
-def recursive_search_and_extract(root_entry, path_parts, output_dir, extract_category, current_path_parts, artifact_info, collected_paths, counter):
-    """정의된 경로 패턴을 따라 재귀적으로 파일을 탐색하고 추출을 요청하는 함수."""
-    category_key = str(extract_category)
-    if category_key not in collected_paths:
-        collected_paths[category_key] = [] # 결과 기록용 딕셔너리 초기화
-    
-    # 경로의 마지막 부분에 도달하면 extract_item 함수 호출
-    if not path_parts:
-        extract_item(root_entry, output_dir, extract_category, current_path_parts, artifact_info, collected_paths, counter); return
 
-    current_part, remaining_parts = path_parts[0], path_parts[1:]
-    if not root_entry.IsDirectory(): return # 현재 위치가 디렉터리가 아니면 탐색 중단
+def partition_cache_key(image_path: Path):
+    """파티션 캐시 키를 만드는 함수. 이미지 전체를 해시하지 않도록 절대 경로, 크기, 수정 시각으로 이미지를 구분함."""
+    stat = image_path.stat()
+    return f"{image_path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+def load_cached_partition(cache_dir, image_path: Path):
+    """이전 실행에서 찾은 Windows 파티션 위치('/p3' 등)를 반환하는 함수. 없거나 읽을 수 없으면 None."""
+    if cache_dir is None:
+        return None
+    try:
+        cache = read_partition_cache(Path(cache_dir) / PARTITION_CACHE_FILE)
+        return cache.get(partition_cache_key(image_path))
+    except OSError:
+        return None
+
 
+def read_partition_cache(cache_file: Path):
+    """파티션 캐시 파일을 dict로 읽는 함수. 파일이 없거나, JSON이 아니거나, 최상위가 객체가 아니면 빈 dict를 반환."""
     try:
-        # 와일드카드 '*' 처리: 현재 디렉터리의 모든 하위 항목에 대해 재귀 호출
+        cache = load_json_bytes(cache_file.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def store_cached_partition(cache_dir, image_path: Path, partition_location):
+    """찾은 Windows 파티션 위치를 캐시 파일에 기록하는 함수. 기록에 실패해도 추출은 계속함."""
+    if cache_dir is None:
+        return
+    cache_file = Path(cache_dir) / PARTITION_CACHE_FILE
+    try:
+        cache = read_partition_cache(cache_file)
+        cache[partition_cache_key(image_path)] = partition_location
+        ensure_directory(cache_file.parent)
+        cache_file.write_bytes(dump_json_bytes(cache))
+    except OSError:
+        pass
+
+
+def open_file_system_root(fs_path_spec):
+    """워커 스레드 전용 리졸버 컨텍스트로 파일 시스템 루트를 새로 열어 (루트 엔트리, 컨텍스트)를 반환하는 함수.
+
+    pytsk3/dfVFS 핸들은 스레드 간 공유가 안전하지 않으므로, 병렬 추출 시 각 워커가 자신만의 컨텍스트로 열어서 사용함.
+    컨텍스트는 작업이 모두 끝난 뒤 호출자가 Empty()로 정리함.
+    """
+    if IS_MOCK_MODE or fs_path_spec is None:
+        return MockDir(name='\\'), None
+    context = resolver_context.Context()
+    return path_spec_resolver.Resolver.OpenFileEntry(fs_path_spec, resolver_context=context), context
+
+
+def ensure_directory(path):
+    """결과 디렉터리를 한 번만 생성하는 함수. 생성한 경로와 그 상위 경로를 모두 캐시에 기록함.
+
+    추출 중에는 파일마다 호출되므로 Path 대신 문자열(os.path)로 처리함. Path를 넘겨도 됨.
+    """
+    path = os.fspath(path)
+    if path in CREATED_DIRECTORIES:
+        return
+    os.makedirs(path, exist_ok=True)
+    while path not in CREATED_DIRECTORIES:
+        CREATED_DIRECTORIES.add(path)
+        parent = os.path.dirname(path)
+        if not parent or parent == path: break
+        path = parent
+
+
+def entry_name(entry):
+    """엔트리 이름을 str로 반환하는 함수. pytsk3 계열 객체처럼 bytes 이름을 주는 경우에만 디코딩함."""
+    name = entry.name
+    return name.decode('utf-8', 'ignore') if isinstance(name, bytes) else name
+
+
+def directory_cache_key(entry):
+    """디렉터리 목록 캐시 키를 만드는 함수.
+
+    같은 디렉터리를 가리키는 다른 엔트리 객체도 공유하도록 path_spec.comparable을 우선 사용하되,
+    pytsk3 핸들을 스레드 간에 공유하지 않도록 스레드 id를 함께 넣음.
+    """
+    path_spec = getattr(entry, 'path_spec', None)
+    comparable = getattr(path_spec, 'comparable', None)
+    if comparable is None:
+        return id(entry)
+    return (threading.get_ident(), comparable)
+
+
+def read_directory(entry):
+    """디렉터리를 한 번만 나열해 (entry, 하위 항목 목록, 대문자 이름 사전, 정렬 색인)을 캐시하고 반환하는 함수.
+
+    정렬 색인은 접두어 검색(list_prefixed_sub_entries)이 처음 필요할 때 채워지는 빈 dict로 시작함.
+    """
+    key = directory_cache_key(entry)
+    with DIRECTORY_LISTING_LOCK:
+        cached = DIRECTORY_LISTING_CACHE.get(key)
+        if cached is not None:
+            DIRECTORY_LISTING_CACHE.move_to_end(key)
+    if cached is None:
+        children = []
+        name_map = {}
+        for sub_entry in entry.sub_file_entries:
+            name_str = entry_name(sub_entry)
+            if name_str not in ('.', '..'):
+                # 'Users', 'AppData', 'Local'처럼 반복되는 이름은 intern해 경로 조각 목록들이 같은 문자열을 공유하게 함
+                name_str = sys.intern(name_str)
+                upper_name = sys.intern(name_str.upper())
+                children.append((name_str, upper_name, sub_entry))
+                name_map.setdefault(upper_name, (name_str, sub_entry)) # 대소문자만 다른 이름은 처음 것을 사용
+        cached = (entry, children, name_map, {})
+        with DIRECTORY_LISTING_LOCK:
+            DIRECTORY_LISTING_CACHE[key] = cached
+            if len(DIRECTORY_LISTING_CACHE) > DIRECTORY_LISTING_CACHE_SIZE:
+                DIRECTORY_LISTING_CACHE.popitem(last=False) # 가장 오래 사용하지 않은 목록부터 제거
+    return cached
+
+
+def list_sub_entries(entry):
+    """디렉터리의 하위 항목을 한 번만 읽어 캐시하고, (이름, 대문자 이름, 엔트리) 목록으로 반환하는 함수.
+
+    여러 아티팩트 경로가 'Users/*/AppData/...' 같은 공통 상위 경로를 공유하므로,
+    같은 디렉터리를 경로마다 다시 나열(MFT/INDX 읽기)하지 않도록 결과를 재사용함.
+    이름 디코딩과 대문자 변환도 디렉터리당 한 번만 수행됨.
+    """
+    return read_directory(entry)[1]
+
+
+def list_prefixed_sub_entries(entry, upper_prefix):
+    """대문자 이름이 upper_prefix로 시작하는 하위 항목만 (이름, 대문자 이름, 엔트리) 목록으로 반환하는 함수.
+
+    Prefetch처럼 항목이 많은 디렉터리에서 'CHATGPT*.PF' 같은 패턴을 전체 비교하지 않도록,
+    대문자 이름 정렬 색인을 디렉터리당 한 번 만들고 bisect로 후보 범위만 확인함 (O(log N + 일치 개수)).
+    결과는 디렉터리 나열 순서를 유지함.
+    """
+    _, children, _, sorted_index = read_directory(entry)
+    if not sorted_index:
+        order = sorted(range(len(children)), key=lambda i: children[i][1])
+        sorted_index["names"] = [children[i][1] for i in order]
+        sorted_index["order"] = order
+    names, order = sorted_index["names"], sorted_index["order"]
+
+    positions = []
+    for i in range(bisect_left(names, upper_prefix), len(names)):
+        if not names[i].startswith(upper_prefix): break
+        positions.append(order[i])
+    positions.sort()
+    return [children[i] for i in positions]
+
+
+def find_sub_entry(entry, upper_name):
+    """대문자 이름으로 하위 항목을 찾아 (이름, 엔트리)를 반환하는 함수. 없으면 None.
+
+    캐시된 {대문자 이름: (이름, 엔트리)} 사전을 쓰므로 디렉터리 크기와 무관하게 O(1)로 찾음.
+    dfVFS의 GetSubFileEntryByName도 내부적으로 하위 항목 전체를 나열하므로, 항상 캐시되는 read_directory를 거쳐
+    같은 디렉터리를 여러 트리 노드에서 찾더라도 한 번만 나열되게 함.
+    """
+    return read_directory(entry)[2].get(upper_name)
+
+
+def pipelined_copy(file_object, outfile):
+    """읽기(EWF 압축 해제 + NTFS 읽기)와 쓰기를 두 스레드로 나눠 지연 시간을 겹치는 복사 함수.
+
+    현재 스레드가 청크를 읽어 크기 제한이 있는 큐에 넣고, 쓰기 스레드가 꺼내 디스크에 씀.
+    """
+    chunks = queue.Queue(maxsize=PIPELINE_DEPTH)
+    write_errors = []
+
+    def writer():
+        while True:
+            chunk = chunks.get()
+            if chunk is None: break
+            if not write_errors:
+                try:
+                    outfile.write(chunk)
+                except Exception as e:
+                    write_errors.append(e) # 읽기 쪽이 멈출 때까지 큐는 계속 비워 줌
+
+    writer_thread = threading.Thread(target=writer, daemon=True)
+    writer_thread.start()
+    try:
+        while not write_errors:
+            chunk = file_object.read(PIPELINE_CHUNK_SIZE)
+            if not chunk: break
+            chunks.put(chunk)
+    finally:
+        chunks.put(None)
+        writer_thread.join()
+    if write_errors:
+        raise write_errors[0]
+
+
+def copy_file_object(file_object, output_target):
+    """dfVFS 파일 객체의 내용을 output_target 경로에 스트리밍으로 복사하는 함수.
+
+    dfVFS 파일 객체(EWF/NTFS)는 OS 파일 디스크립터가 없으므로 항상 파이썬 쪽에서 읽고 씀.
+    크기에 따라 작은 파일은 한 번에 읽고 쓰고, 큰 파일은 pipelined_copy로 읽기/쓰기를 겹치며,
+    나머지는 큰 버퍼의 shutil.copyfileobj를 사용함.
+    """
+    with open(output_target, 'wb') as outfile:
+        get_size = getattr(file_object, 'get_size', None)
+        file_size = get_size() if get_size is not None else None
+        if file_size is not None and file_size <= SMALL_FILE_SIZE:
+            # 작은 파일(캐시/leveldb 조각 등)은 반복문 없이 한 번에 읽고 씀
+            data = file_object.read(file_size)
+            outfile.write(data)
+            if len(data) < file_size:
+                # 한 번의 read가 요청한 크기보다 적게 반환하면 나머지는 일반 복사로 이어서 씀
+                shutil.copyfileobj(file_object, outfile, COPY_BUFFER_SIZE)
+        elif file_size is not None and file_size >= PIPELINE_MIN_SIZE:
+            pipelined_copy(file_object, outfile)
+        else:
+            shutil.copyfileobj(file_object, outfile, COPY_BUFFER_SIZE)
+
+
+def start_bundles(program_output_dir: Path):
+    """--bundle 모드를 켜는 함수. 이후 추출되는 파일은 program_output_dir/<카테고리>.tar에 기록됨."""
+    global BUNDLE_OUTPUT_DIR
+    BUNDLE_OUTPUT_DIR = program_output_dir
+    OPEN_BUNDLES.clear()
+
+
+def open_bundle(output_target):
+    """output_target에 대응하는 카테고리 tar 묶음을 (TarFile, 잠금, manifest) 튜플과 tar 멤버 이름으로 반환하는 함수."""
+    relative_parts = os.path.relpath(output_target, BUNDLE_OUTPUT_DIR).split(os.sep)
+    category, member_name = relative_parts[0], '/'.join(relative_parts[1:])
+
+    with OPEN_BUNDLES_LOCK: # tar 파일은 카테고리별로 처음 필요할 때 한 번만 엶
+        bundle = OPEN_BUNDLES.get(category)
+        if bundle is None:
+            archive = tarfile.open(BUNDLE_OUTPUT_DIR / f"{category}.tar", 'w', copybufsize=COPY_BUFFER_SIZE)
+            bundle = OPEN_BUNDLES[category] = (archive, threading.Lock(), {})
+    return bundle, member_name
+
+
+def bundle_file_object(file_object, output_target, original_full_path):
+    """파일 객체를 output_target에 대응하는 카테고리 tar 묶음에 멤버로 추가하는 함수.
+
+    tarfile은 헤더를 먼저 쓰고 내용을 복사하므로, 손상된 이미지에서 읽기가 중간에 실패하면
+    기록 위치와 offset을 추가 전 상태로 되돌리고 잘라내어 tar 묶음 전체가 깨지지 않게 함.
+    """
+    (archive, lock, manifest), member_name = open_bundle(output_target)
+
+    get_size = getattr(file_object, 'get_size', None)
+    if get_size is not None:
+        size = get_size()
+    else:
+        size = file_object.seek(0, os.SEEK_END)
+        file_object.seek(0)
+    member = tarfile.TarInfo(member_name)
+    member.size = size
+    member.mode = 0o644
+    with lock:
+        position, offset = archive.fileobj.tell(), archive.offset
+        try:
+            archive.addfile(member, file_object)
+        except BaseException:
+            archive.fileobj.seek(position)
+            archive.fileobj.truncate()
+            archive.offset = offset
+            raise
+        manifest[original_full_path] = member_name
+
+
+def bundle_directory(output_path, original_full_path):
+    """디렉터리를 카테고리 tar 묶음에 디렉터리 멤버로 추가하는 함수. 빈 디렉터리도 묶음에 남도록 함."""
+    (archive, lock, manifest), member_name = open_bundle(output_path)
+    member = tarfile.TarInfo(member_name)
+    member.type = tarfile.DIRTYPE
+    member.mode = 0o755
+    with lock:
+        archive.addfile(member)
+        manifest[original_full_path] = member_name
+
+
+def close_bundles():
+    """열려 있는 tar 묶음을 모두 닫고, 원본 경로와 tar 멤버 이름의 대응표(manifest.json)를 기록하는 함수."""
+    global BUNDLE_OUTPUT_DIR
+    if BUNDLE_OUTPUT_DIR is None:
+        return
+    manifest = {}
+    for category, (archive, _, members) in sorted(OPEN_BUNDLES.items()):
+        archive.close()
+        manifest[category] = {"archive": f"{category}.tar", "members": members}
+    (BUNDLE_OUTPUT_DIR / "manifest.json").write_bytes(dump_json_bytes(manifest))
+    OPEN_BUNDLES.clear()
+    BUNDLE_OUTPUT_DIR = None
+
+
+def start_copy_threads(max_workers):
+    """--copy-threads 모드를 켜는 함수. 이후 extract_file은 복사 작업을 스레드 풀에 제출함."""
+    global COPY_EXECUTOR, COPY_SLOTS
+    COPY_EXECUTOR = ThreadPoolExecutor(max_workers=max_workers)
+    COPY_SLOTS = threading.BoundedSemaphore(max_workers * COPY_QUEUE_PER_THREAD)
+    COPY_FUTURES.clear()
+    COPY_CONTEXTS.clear()
+
+
+def copy_thread_entry(entry):
+    """복사 스레드에서 사용할 엔트리를 반환하는 함수.
+
+    dfVFS 핸들은 스레드 간 공유가 안전하지 않으므로, 복사 스레드마다 자신만의 리졸버 컨텍스트로 path_spec을 다시 엶.
+    """
+    if IS_MOCK_MODE:
+        return entry
+    context = getattr(COPY_THREAD_STATE, "context", None)
+    if context is None:
+        context = COPY_THREAD_STATE.context = resolver_context.Context()
+        COPY_CONTEXTS.append(context)
+    return path_spec_resolver.Resolver.OpenFileEntry(entry.path_spec, resolver_context=context)
+
+
+def record_finished_copies():
+    """제출 순서의 앞쪽부터 이미 끝난 복사 작업을 꺼내 실패 메시지를 기록하는 함수 (COPY_FUTURES_LOCK을 잡은 상태에서 호출).
+
+    끝난 future를 바로 버리므로 COPY_FUTURES가 전체 파일 수만큼 자라지 않음. 실패 기록 순서는 제출 순서와 같음.
+    """
+    while COPY_FUTURES and COPY_FUTURES[0][0].done():
+        future, category_paths = COPY_FUTURES.popleft()
+        error_message = future.result()
+        if error_message:
+            category_paths[error_message] = None
+
+
+def finish_copy_threads():
+    """제출된 복사 작업이 모두 끝날 때까지 기다리고, 실패 메시지를 각 카테고리 경로 목록에 기록하는 함수."""
+    global COPY_EXECUTOR, COPY_SLOTS
+    if COPY_EXECUTOR is None:
+        return
+    with COPY_FUTURES_LOCK:
+        while COPY_FUTURES: # 제출 순서대로 기록하여 보고서의 실패 순서를 일정하게 유지
+            future, category_paths = COPY_FUTURES.popleft()
+            error_message = future.result()
+            if error_message:
+                category_paths[error_message] = None
+    COPY_EXECUTOR.shutdown()
+    for context in COPY_CONTEXTS:
+        context.Empty()
+    COPY_FUTURES.clear()
+    COPY_CONTEXTS.clear()
+    COPY_EXECUTOR = None
+    COPY_SLOTS = None
+
+
+def build_artifact_trie(jobs, llm_name=None):
+    """여러 카테고리의 아티팩트 경로를 공통 접두 경로 기준의 트리(trie) 하나로 합치는 함수.
+
+    jobs는 [(카테고리 키, [artifact_info, ...]), ...] 형태.
+    각 노드는 {"children": {경로 조각: 노드}, "matcher": 대문자 이름용 매칭 함수 또는 None, "prefix": 패턴의 첫 '*' 앞 고정 부분,
+    "artifacts": [(카테고리 키, 카테고리 Path, ArtifactSpec), ...], "categories": {이 노드 아래로 이어지는 카테고리 키: None}} 형태.
+    휴리스틱 모드에서는 llm_name으로 경로의 {LLM_NAME}을 치환함.
+    """
+    root = {"children": {}, "matcher": None, "prefix": "", "artifacts": [], "categories": {}}
+    for category_key, artifacts in jobs:
+        extract_category = category_key # 결과 경로는 os.path.join으로 만들므로 문자열 그대로 사용
+        for artifact_info in artifacts:
+            spec = artifact_spec(artifact_info, llm_name)
+            node = root
+            for part, matcher in spec.path_parts:
+                node["categories"][category_key] = None # 디렉터리 읽기 실패 시 오류를 기록할 카테고리
+                if part not in node["children"]:
+                    prefix = part.split('*', 1)[0] if matcher else ""
+                    node["children"][part] = {"children": {}, "matcher": matcher, "prefix": prefix, "artifacts": [], "categories": {}}
+                node = node["children"][part]
+            node["artifacts"].append((category_key, extract_category, spec))
+    index_trie_categories(root)
+    return root
+
+
+def index_trie_categories(node):
+    """각 노드에 "pending_from"을 채우는 함수. pending_from[i]는 i번째 이후 자식 경로 아래에서 끝나는 카테고리 키의 frozenset.
+
+    탐색 중 어떤 카테고리가 더 이상 방문될 수 없는지(완료) 판단하는 데 사용함. 트리 깊이는 경로 조각 수 정도이므로 재귀로 처리함.
+    """
+    pending_from = []
+    remaining = frozenset()
+    for child_node in reversed(list(node["children"].values())):
+        index_trie_categories(child_node)
+        remaining = remaining.union(child_node["categories"], (category_key for category_key, _, _ in child_node["artifacts"]))
+        pending_from.append(remaining)
+    pending_from.reverse()
+    node["pending_from"] = pending_from
+
+
+def search_and_extract(root_entry, trie_node, output_dir, current_path_parts, collected_paths, counter, on_category_done=None):
+    """아티팩트 경로 트리를 따라 파일 시스템을 한 번만 깊이 우선 탐색하며, 경로가 끝나는 지점에서 추출을 요청하는 함수.
+
+    재귀 호출 대신 [하위 항목 반복자, 트리 노드, 경로, 현재 자식 순번] 스택을 사용하므로 깊은 디렉터리에서도 파이썬 프레임이 쌓이지 않음.
+    방문 순서와 오류 기록 위치는 재귀 탐색과 동일함.
+    collected_paths는 {카테고리 키: {경로: None}} 형태로, 카테고리별 dict를 삽입 순서를 유지하는 중복 없는 집합으로 사용함.
+    on_category_done을 주면, 어떤 카테고리의 남은 경로가 스택 어디에서도 더 방문될 수 없게 되는 즉시 그 카테고리 키로 호출함
+    (여러 카테고리를 한 번에 탐색할 때 프로그레스 바를 카테고리 단위로 진행하기 위함).
+    """
+    pending = dict.fromkeys(trie_node["categories"]) if on_category_done is not None else {}
+    matches = visit_trie_node(root_entry, trie_node, output_dir, current_path_parts, collected_paths, counter)
+    stack = [[matches, trie_node, current_path_parts, 0]] if matches is not None else []
+
+    while stack:
+        frame = stack[-1]
+        matches, node, path_parts, _ = frame
+        try:
+            found = next(matches, None)
+            if found is None: # 이 디렉터리의 탐색이 끝나면 상위 디렉터리로 복귀
+                stack.pop()
+                if pending: report_finished_categories(stack, pending, on_category_done)
+                continue
+            child_index, found_entry, child_node, child_path_parts = found
+            if pending and child_index != frame[3]: # 다음 자식 경로로 넘어가면 앞 자식에서만 끝나는 카테고리는 완료
+                frame[3] = child_index
+                report_finished_categories(stack, pending, on_category_done)
+            child_matches = visit_trie_node(found_entry, child_node, output_dir, child_path_parts, collected_paths, counter)
+            if child_matches is not None:
+                stack.append([child_matches, child_node, child_path_parts, 0])
+        except Exception as e:
+            # 디렉터리 읽기 실패 시, 이 디렉터리 아래를 찾던 모든 카테고리에 오류 기록 후 이 디렉터리 탐색 중단
+            error_message = f"[EXTRACTION_FAILED] Could not read directory '{'/'.join(path_parts)}': {e}"
+            for category_key in node["categories"]:
+                collected_paths[category_key][error_message] = None
+            stack.pop()
+            if pending: report_finished_categories(stack, pending, on_category_done)
+
+    for category_key in pending: # 탐색이 끝나면 남은 카테고리도 모두 완료
+        on_category_done(category_key)
+
+
+def report_finished_categories(stack, pending, on_category_done):
+    """스택에 남은 어떤 반복자도 더 이상 도달할 수 없는 카테고리를 pending에서 빼고 on_category_done으로 알리는 함수."""
+    reachable = set()
+    for _, node, _, child_index in stack:
+        reachable.update(node["pending_from"][child_index])
+    for category_key in [key for key in pending if key not in reachable]:
+        del pending[category_key]
+        on_category_done(category_key)
+
+
+def visit_trie_node(entry, trie_node, output_dir, current_path_parts, collected_paths, counter):
+    """트리 노드에 도착한 엔트리를 처리하는 함수. 이 노드에서 끝나는 아티팩트를 추출하고, 더 내려갈 하위 항목 반복자를 반환함 (없으면 None)."""
+    # 이 노드에서 끝나는 아티팩트 경로가 있으면 해당 카테고리로 extract_item 함수 호출
+    for category_key, extract_category, spec in trie_node["artifacts"]:
+        extract_item(entry, output_dir, extract_category, current_path_parts, spec, collected_paths[category_key], counter)
+
+    if not trie_node["children"]: return None
+    if not entry.IsDirectory(): return None # 현재 위치가 디렉터리가 아니면 탐색 중단
+    return iter_trie_matches(entry, trie_node, current_path_parts)
+
+
+def iter_trie_matches(entry, trie_node, current_path_parts):
+    """디렉터리 엔트리의 하위 항목 중 트리 노드의 자식 경로 조각과 일치하는 항목을 (자식 순번, 엔트리, 자식 노드, 경로)로 하나씩 반환하는 제너레이터."""
+    for child_index, (current_part, child_node) in enumerate(trie_node["children"].items()):
+        # 와일드카드 '*' 처리: 현재 디렉터리의 모든 하위 항목
         if current_part == '*':
-            for sub_entry in root_entry.sub_file_entries:
-                name_str = sub_entry.name
-                if name_str in ['.', '..']: continue
-                recursive_search_and_extract(sub_entry, remaining_parts, output_dir, extract_category, current_path_parts + [name_str], artifact_info, collected_paths, counter)
+            found_entries = [(name_str, sub_entry) for name_str, _, sub_entry in list_sub_entries(entry)]
+        # 'CHATGPT*.pf' 같은 패턴 매칭 처리 (고정 접두어가 있으면 정렬 색인으로 후보만 비교)
+        elif child_node["matcher"]:
+            matcher = child_node["matcher"]
+            candidates = list_prefixed_sub_entries(entry, child_node["prefix"]) if child_node["prefix"] else list_sub_entries(entry)
+            found_entries = [(name_str, sub_entry) for name_str, upper_name, sub_entry in candidates if matcher(upper_name)]
         else:
-            found_entries = []
-            # 'CHATGPT*.pf' 같은 패턴 매칭 처리
-            if '*' in current_part:
-                pattern_str = '.*'.join(map(re.escape, current_part.split('*')))
-                pattern = re.compile(pattern_str, re.IGNORECASE)
-                for entry in root_entry.sub_file_entries:
-                    if pattern.match(entry.name): found_entries.append(entry)
-            else:
-                # 정확한 이름으로 파일/디렉터리 찾기 (대소문자 구분 시도 후 미구분으로 재시도)
-                entry = root_entry.GetSubFileEntryByName(current_part)
-                if not entry:
-                    for sub_entry in root_entry.sub_file_entries:
-                        if sub_entry.name.lower() == current_part.lower():
-                            entry = sub_entry
-                            break
-                if entry:
-                    found_entries.append(entry)
-
-            # 찾은 각 항목에 대해 재귀적으로 탐색 계속
-            for found_entry in found_entries:
-                recursive_search_and_extract(found_entry, remaining_parts, output_dir, extract_category, current_path_parts + [found_entry.name], artifact_info, collected_paths, counter)
-    
-    except Exception as e:
-        # 디렉터리 읽기 실패 시 오류 기록
-        error_message = f"[EXTRACTION_FAILED] Could not read directory '{'/'.join(current_path_parts)}': {e}"
-        if error_message not in collected_paths[category_key]: collected_paths[category_key].append(error_message)
+            # 정확한 이름으로 파일/디렉터리 찾기 (경로 조각은 이미 대문자로 정규화되어 있으므로 대문자 이름 사전으로 조회)
+            found = find_sub_entry(entry, current_part)
+            found_entries = [found] if found else []
 
+        for name_str, found_entry in found_entries:
+            yield child_index, found_entry, child_node, current_path_parts + [name_str]
 
-def extract_item(entry, output_dir, extract_category, current_path_parts, artifact_info, collected_paths, counter):
-    """실제로 파일이나 디렉터리를 디스크에 복사(추출)하는 함수."""
-    is_file = entry.IsFile()
-    is_directory = entry.IsDirectory()
+
+def extract_item(entry, output_dir, extract_category, current_path_parts, spec, category_paths, counter):
+    """매칭된 엔트리를 종류에 맞는 추출 함수(파일 / 디렉터리 전체 / 디렉터리 내 특정 파일)로 넘기는 함수."""
     original_full_path = '/' + '/'.join(current_path_parts)
-    category_key = str(extract_category)
 
     # 추출된 경로를 로그에 기록
-    if original_full_path not in collected_paths[category_key]:
-        collected_paths[category_key].append(original_full_path)
+    category_paths[original_full_path] = None
+
+    # 엔트리 종류는 한 번만 확인 (파일이면 디렉터리 여부는 확인할 필요 없음)
+    if entry.IsFile():
+        output_target = os.path.join(output_dir, extract_category, *relative_output_parts(current_path_parts, spec.extract_root_upper))
+        extract_file(entry, output_target, original_full_path, category_paths, counter)
+    elif entry.IsDirectory():
+        # "extract_files" 옵션이 있으면 디렉터리 내 특정 파일들만 추출
+        if spec.extract_files_upper is not None:
+            extract_filtered_files(entry, output_dir, extract_category, current_path_parts, spec.extract_files_upper, category_paths, counter)
+        else:
+            extract_directory(entry, output_dir, extract_category, current_path_parts, spec.extract_root_upper, category_paths, counter)
 
-    # "extract_files" 옵션이 있으면 디렉터리 내 특정 파일들만 추출
-    if "extract_files" in artifact_info and is_directory:
-        target_files_upper = [f.upper() for f in artifact_info["extract_files"]]
-        try:
-            for sub_entry in entry.sub_file_entries:
-                if sub_entry.name.upper() in target_files_upper:
-                    new_info = {"extract_from": sub_entry.name}
-                    extract_item(sub_entry, output_dir, extract_category, current_path_parts + [sub_entry.name], new_info, collected_paths, counter)
-        except Exception as e:
-            error_message = f"[EXTRACTION_FAILED] Failed to list items in directory '{original_full_path}': {e}"
-            if error_message not in collected_paths[category_key]: collected_paths[category_key].append(error_message)
-        return
 
-    # 결과 폴더에 저장될 상대 경로 계산
-    relative_path_parts = []
-    extract_root_name = artifact_info.get("extract_from", "").upper().replace('\\', '/').split('/')[-1]
-    if "{LLM_NAME}" in extract_root_name: # 휴리스틱 모드용 플레이스홀더 처리
-        llm_name_placeholder = artifact_info.get("llm_name_placeholder", "").upper()
-        extract_root_name = extract_root_name.replace("{LLM_NAME}", llm_name_placeholder)
+def relative_output_parts(current_path_parts, extract_root_name):
+    """결과 폴더에 저장될 상대 경로 조각을 계산하는 함수.
+
+    'extract_from' 기준 이름이 경로에 있으면 그 위치부터 자르고, 없으면 마지막 이름만 사용함.
+    """
+    start_index = output_root_index(current_path_parts, extract_root_name)
+    return current_path_parts[start_index:] if start_index >= 0 else [current_path_parts[-1]]
+
 
+def output_root_index(current_path_parts, extract_root_name):
+    """경로 조각 중 'extract_from' 기준 이름(대문자)과 같은 마지막 조각의 위치를 반환하는 함수. 없으면 -1."""
     if extract_root_name:
-        upper_path_parts = [p.upper() for p in current_path_parts]
-        try:
-            # 'extract_from' 기준으로 경로를 잘라 상대 경로를 만듦
-            start_index = len(upper_path_parts) - 1 - upper_path_parts[::-1].index(extract_root_name)
-            relative_path_parts = current_path_parts[start_index:]
-        except ValueError:
-            relative_path_parts = [current_path_parts[-1]]
-    else:
-        relative_path_parts = [current_path_parts[-1]]
-    
-    # 최종적으로 파일이 저장될 경로 설정
-    output_target = Path(output_dir) / extract_category / Path(*relative_path_parts)
+        # 기준 이름은 보통 경로 끝쪽에 있으므로 뒤에서부터 검색
+        for start_index in range(len(current_path_parts) - 1, -1, -1):
+            if current_path_parts[start_index].upper() == extract_root_name:
+                return start_index
+    return -1
+
+
+def extract_file(entry, output_target, original_full_path, category_paths, counter):
+    """파일 하나를 output_target 경로로 복사(추출)하는 함수. --copy-threads 모드에서는 복사를 스레드 풀에 넘김."""
+    counter['count'] += 1
+    if BUNDLE_OUTPUT_DIR is None:
+        ensure_directory(os.path.dirname(output_target))
+    if COPY_EXECUTOR is not None:
+        COPY_SLOTS.acquire() # 대기 중인 복사가 가득 차면 복사 스레드가 따라올 때까지 탐색을 멈춤
+        future = COPY_EXECUTOR.submit(copy_entry_in_thread, entry, output_target, original_full_path)
+        future.add_done_callback(lambda _: COPY_SLOTS.release())
+        with COPY_FUTURES_LOCK:
+            COPY_FUTURES.append((future, category_paths))
+            record_finished_copies()
+        return
+    error_message = copy_entry(entry, output_target, original_full_path)
+    if error_message:
+        category_paths[error_message] = None
 
-    if is_file:
-        counter['count'] += 1
-        output_target.parent.mkdir(parents=True, exist_ok=True)
-        try:
-            # 파일 객체를 열어 청크 단위로 읽고 디스크에 씀
-            file_object = entry.GetFileObject()
-            if file_object:
-                with open(output_target, 'wb') as outfile:
-                    while True:
-                        chunk = file_object.read(1024 * 1024) # 1MB씩 읽기
-                        if not chunk: break
-                        outfile.write(chunk)
+
+def copy_entry(entry, output_target, original_full_path):
+    """엔트리의 파일 내용을 output_target에 기록하는 함수. 실패하면 실패 메시지를, 성공하면 None을 반환함."""
+    try:
+        # 파일 객체를 열어 큰 버퍼 단위로 디스크에 복사 (--bundle 모드에서는 카테고리 tar에 추가)
+        file_object = entry.GetFileObject()
+        if file_object:
+            try:
+                if BUNDLE_OUTPUT_DIR is None:
+                    copy_file_object(file_object, output_target)
+                else:
+                    bundle_file_object(file_object, output_target, original_full_path)
+            finally:
                 file_object.close()
-        except Exception as e:
-            error_message = f"[EXTRACTION_FAILED] Failed to write file '{original_full_path}' to '{output_target}': {e}"
-            if error_message not in collected_paths[category_key]: collected_paths[category_key].append(error_message)
-    elif is_directory:
-        counter['count'] += 1
-        output_target.mkdir(parents=True, exist_ok=True)
+    except Exception as e:
+        return f"[EXTRACTION_FAILED] Failed to write file '{original_full_path}' to '{output_target}': {e}"
+    return None
+
+
+def copy_entry_in_thread(entry, output_target, original_full_path):
+    """복사 스레드에서 실행되는 copy_entry. 스레드 전용 컨텍스트로 엔트리를 다시 연 뒤 복사함."""
+    try:
+        entry = copy_thread_entry(entry)
+    except Exception as e:
+        return f"[EXTRACTION_FAILED] Failed to write file '{original_full_path}' to '{output_target}': {e}"
+    return copy_entry(entry, output_target, original_full_path)
+
+
+def directory_identity(entry):
+    """디렉터리를 파일 시스템 안에서 식별하는 값(MFT 번호/inode)을 반환하는 함수. 알 수 없으면 None.
+
+    path_spec.comparable은 경로 문자열을 포함하므로, 다른 경로로 같은 디렉터리에 다시 들어가는 순환은 inode로만 알 수 있음.
+    """
+    path_spec = getattr(entry, 'path_spec', None)
+    identity = getattr(path_spec, 'inode', None)
+    if identity is None:
+        identity = getattr(path_spec, 'mft_entry', None)
+    return identity
+
+
+def extract_directory(entry, output_dir, extract_category, current_path_parts, extract_root_name, category_paths, counter):
+    """디렉터리와 그 하위 항목 전체를 복사(추출)하는 함수.
+
+    재귀 호출 대신 [디렉터리 엔트리, 경로, 하위 항목 반복자, 기준 이름 위치, 결과 디렉터리, 원본 전체 경로] 스택으로
+    깊이 우선 순회하며, 순서와 오류 기록 위치는 재귀 방식과 동일함.
+    결과 경로와 원본 경로 문자열은 디렉터리마다 한 번만 계산하고, 하위 항목은 이름만 덧붙여 만듦
+    (relative_output_parts와 같은 규칙: 기준 이름이 경로에 없거나 항목 이름 자체가 기준 이름이면 카테고리 바로 아래에 저장).
+    손상된 이미지에서 디렉터리 항목이 상위 디렉터리를 다시 가리키면 무한히 내려가지 않도록, 이미 들어간 디렉터리(inode)는 실패로 기록하고 건너뜀.
+    """
+    category_dir = os.path.join(output_dir, extract_category)
+    root_index = output_root_index(current_path_parts, extract_root_name)
+    output_path = os.path.join(category_dir, *(current_path_parts[root_index:] if root_index >= 0 else current_path_parts[-1:]))
+    full_path = '/' + '/'.join(current_path_parts)
+    counter['count'] += 1
+    if BUNDLE_OUTPUT_DIR is None:
+        ensure_directory(output_path)
+    else: # tar 묶음에서는 디렉터리를 만들지 않고 디렉터리 멤버로 기록 (빈 디렉터리도 남김)
+        bundle_directory(output_path, full_path)
+    stack = [[entry, current_path_parts, None, root_index, output_path, full_path]]
+    visited_directories = {directory_identity(entry)}
+
+    while stack:
+        frame = stack[-1]
+        dir_entry, dir_path_parts, sub_entries, dir_root_index, dir_output_path, dir_full_path = frame
         try:
-            # 디렉터리인 경우, 하위 항목들에 대해 재귀적으로 추출 함수 호출
-            for sub_entry in entry.sub_file_entries:
-                if sub_entry.name not in ['.', '..']:
-                    extract_item(sub_entry, output_dir, extract_category, current_path_parts + [sub_entry.name], artifact_info, collected_paths, counter)
+            if sub_entries is None:
+                sub_entries = frame[2] = iter(dir_entry.sub_file_entries)
+            sub_entry = next(sub_entries, None)
+            if sub_entry is None: # 이 디렉터리의 하위 항목을 모두 처리하면 상위 디렉터리로 복귀
+                stack.pop()
+                continue
+
+            # 하위 항목마다 경로를 기록하고, 파일은 바로 추출하고 디렉터리는 스택에 추가
+            name_str = entry_name(sub_entry) # 이름은 항목마다 한 번만 읽고 디코딩
+            if name_str == '.' or name_str == '..': continue
+            sub_full_path = dir_full_path + '/' + name_str
+            category_paths[sub_full_path] = None
+
+            sub_root_index = dir_root_index
+            if extract_root_name and name_str.upper() == extract_root_name:
+                sub_root_index = len(dir_path_parts)
+            if sub_root_index < 0 or sub_root_index == len(dir_path_parts):
+                sub_output_path = os.path.join(category_dir, name_str)
+            else:
+                sub_output_path = os.path.join(dir_output_path, name_str)
+
+            if sub_entry.IsFile():
+                extract_file(sub_entry, sub_output_path, sub_full_path, category_paths, counter)
+            elif sub_entry.IsDirectory():
+                identity = directory_identity(sub_entry)
+                if identity is not None:
+                    if identity in visited_directories:
+                        category_paths[f"[EXTRACTION_FAILED] Skipped directory '{sub_full_path}': already visited (directory cycle)"] = None
+                        continue
+                    visited_directories.add(identity)
+                counter['count'] += 1
+                if BUNDLE_OUTPUT_DIR is None:
+                    ensure_directory(sub_output_path)
+                else:
+                    bundle_directory(sub_output_path, sub_full_path)
+                stack.append([sub_entry, dir_path_parts + [name_str], None, sub_root_index, sub_output_path, sub_full_path])
         except Exception as e:
-            error_message = f"[EXTRACTION_FAILED] Failed to process subdirectory in '{original_full_path}': {e}"
-            if error_message not in collected_paths[category_key]: collected_paths[category_key].append(error_message)
+            error_message = f"[EXTRACTION_FAILED] Failed to process subdirectory in '{dir_full_path}': {e}"
+            category_paths[error_message] = None
+            stack.pop()
+
+
+def extract_filtered_files(entry, output_dir, extract_category, current_path_parts, target_files_upper, category_paths, counter):
+    """디렉터리 바로 아래에서 'extract_files'에 지정된 이름의 항목만 추출하는 함수."""
+    try:
+        for name_str, upper_name, sub_entry in list_sub_entries(entry):
+            if upper_name in target_files_upper:
+                extract_item(sub_entry, output_dir, extract_category, current_path_parts + [name_str], ArtifactSpec((), upper_name, None), category_paths, counter)
+    except Exception as e:
+        error_message = f"[EXTRACTION_FAILED] Failed to list items in directory '/{'/'.join(current_path_parts)}': {e}"
+        category_paths[error_message] = None
 
 
 def header_panel(image_path, llm_name, mode, output_dir):
@@ -293,10 +984,21 @@ def header_panel(image_path, llm_name, mode, output_dir):
     console.print(panel)
 
 
-def final_summary(collected_paths, llm_name, program_output_dir, path_log_file_path, keep_plus=True, show_table=True, show_final_summary=True):
+def count_collected_paths(collected_paths):
+    """카테고리별 (성공, 실패) 개수를 한 번에 계산하는 함수. 요약 출력/로그 작성에서 공통으로 사용함."""
+    category_counts = {}
+    for category_key, paths in collected_paths.items():
+        failed = sum(1 for p in paths if p.startswith(FAILED_PREFIX))
+        category_counts[category_key] = (len(paths) - failed, failed)
+    return category_counts
+
+
+def final_summary(collected_paths, llm_name, program_output_dir, path_log_file_path, keep_plus=True, show_table=True, show_final_summary=True, category_counts=None):
     """프로그램 종료 시 추출 결과 요약 테이블과 최종 메시지를 출력하는 함수."""
-    total_succeeded = sum(1 for paths in collected_paths.values() for p in paths if not str(p).startswith("[EXTRACTION_FAILED]"))
-    total_failed = sum(1 for paths in collected_paths.values() for p in paths if str(p).startswith("[EXTRACTION_FAILED]"))
+    if category_counts is None:
+        category_counts = count_collected_paths(collected_paths)
+    total_succeeded = sum(succeeded for succeeded, _ in category_counts.values())
+    total_failed = sum(failed for _, failed in category_counts.values())
 
     # 요약 테이블 출력 (--no-show-summary 옵션으로 비활성화 가능)
     if show_table:
@@ -311,10 +1013,8 @@ def final_summary(collected_paths, llm_name, program_output_dir, path_log_file_p
         table.add_column("Extracted", justify="right")
         table.add_column("Failed", justify="right")
 
-        for category_key, paths in sorted(collected_paths.items()):
+        for category_key, (succeeded, failed) in sorted(category_counts.items()):
             label = category_key if keep_plus else category_key.replace("+", "_")
-            succeeded = sum(1 for p in paths if not str(p).startswith("[EXTRACTION_FAILED]"))
-            failed = len(paths) - succeeded
             failed_str = f"[red]{failed}[/red]" if failed > 0 else str(failed)
             table.add_row(label, str(succeeded), failed_str)
         
@@ -330,66 +1030,66 @@ def final_summary(collected_paths, llm_name, program_output_dir, path_log_file_p
         console.print(f"[dim]Result Folder:[/dim] {program_output_dir.resolve()}")
 
 
-def write_extracted_paths_log(collected_paths, program_output_dir, image_name, llm_name, mode, keep_plus=True):
+def write_extracted_paths_log(collected_paths, program_output_dir, image_name, llm_name, mode, keep_plus=True, category_counts=None):
     """추출된 모든 경로와 실패 정보를 상세 로그 파일로 저장하는 함수."""
     # 파일명은 extraction_report.txt (또는 .md)로 고정
     path_log_file_path = Path(program_output_dir) / "extraction_report.txt"
     
-    total_succeeded = sum(1 for paths in collected_paths.values() for p in paths if not str(p).startswith("[EXTRACTION_FAILED]"))
-    total_failed = sum(1 for paths in collected_paths.values() for p in paths if str(p).startswith("[EXTRACTION_FAILED]"))
+    if category_counts is None:
+        category_counts = count_collected_paths(collected_paths)
+    total_succeeded = sum(succeeded for succeeded, _ in category_counts.values())
+    total_failed = sum(failed for _, failed in category_counts.values())
 
-    with open(path_log_file_path, 'w', encoding='utf-8') as f:
+    # 보고서 전체를 문자열 조각 목록으로 만든 뒤 한 번에 기록
+    lines = [
         # 헤더
-        f.write("===============================================================\n")
-        f.write(" extract_llm - LLM Forensic Artifact Extraction Log\n")
-        f.write("===============================================================\n\n")
+        "===============================================================\n",
+        " extract_llm - LLM Forensic Artifact Extraction Log\n",
+        "===============================================================\n\n",
 
         # 실행 정보
-        f.write("Run Details\n")
-        f.write("-----------\n")
-        f.write(f"- Source Image: {image_name}\n")
-        f.write(f"- LLM Target: {llm_name} (Mode: {mode})\n")
-        f.write(f"- Output Directory: {program_output_dir.resolve()}\n")
-        f.write(f"- Timestamp: {datetime.now().isoformat()}\n\n")
+        "Run Details\n",
+        "-----------\n",
+        f"- Source Image: {image_name}\n",
+        f"- LLM Target: {llm_name} (Mode: {mode})\n",
+        f"- Output Directory: {program_output_dir.resolve()}\n",
+        f"- Timestamp: {datetime.now().isoformat()}\n\n",
 
         # 추출 요약
-        f.write("Extraction Summary\n")
-        f.write("------------------\n")
-        f.write(f"- Categories Processed: {len(collected_paths)}\n")
-        f.write(f"- Successful Extractions: {total_succeeded}\n")
-        f.write(f"- Failed Extractions: {total_failed}\n\n")
+        "Extraction Summary\n",
+        "------------------\n",
+        f"- Categories Processed: {len(collected_paths)}\n",
+        f"- Successful Extractions: {total_succeeded}\n",
+        f"- Failed Extractions: {total_failed}\n\n",
 
         # 상세 경로 로그
-        f.write("===============================================================\n")
-        f.write(" Detailed Path Log\n")
-        f.write("===============================================================\n")
-
-        for category_key, paths in sorted(collected_paths.items()):
-            header = category_key if keep_plus else category_key.replace('+', '_')
-            succeeded = sum(1 for p in paths if not str(p).startswith("[EXTRACTION_FAILED]"))
-            failed = len(paths) - succeeded
-            
-            f.write(f"\n\n## Category: {header} ({succeeded} succeeded, {failed} failed)\n")
-            f.write("---------------------------------------------------------------\n")
-            
-            if not paths:
-                f.write("- No paths found for this category.\n")
-                continue
+        "===============================================================\n",
+        " Detailed Path Log\n",
+        "===============================================================\n",
+    ]
 
-            # 실패한 경로를 로그 하단에 정렬
-            sorted_paths = sorted(paths, key=lambda p: "ZZZ" if "[EXTRACTION_FAILED]" in p else p)
+    for category_key, paths in sorted(collected_paths.items()):
+        header = category_key if keep_plus else category_key.replace('+', '_')
+        succeeded, failed = category_counts[category_key]
 
-            for p in sorted_paths:
-                if str(p).startswith("[EXTRACTION_FAILED]"):
-                    status = "[FAILED] "
-                    path_to_log = p.replace("[EXTRACTION_FAILED] ", "")
-                else:
-                    status = "[SUCCESS]"
-                    path_to_log = p
-                f.write(f"{status.ljust(10)} {path_to_log}\n")
+        lines.append(f"\n\n## Category: {header} ({succeeded} succeeded, {failed} failed)\n")
+        lines.append("---------------------------------------------------------------\n")
+
+        if not paths:
+            lines.append("- No paths found for this category.\n")
+            continue
+
+        # 성공 경로는 정렬해서 먼저, 실패한 경로는 기록된 순서대로 로그 하단에 배치 (경로마다 접두어는 한 번만 확인)
+        succeeded_paths, failed_paths = [], []
+        for p in paths:
+            (failed_paths if p.startswith(FAILED_PREFIX) else succeeded_paths).append(p)
+        succeeded_paths.sort()
+        lines.extend(f"{'[SUCCESS]'.ljust(10)} {p}\n" for p in succeeded_paths)
+        lines.extend(f"{'[FAILED] '.ljust(10)} {p.replace('[EXTRACTION_FAILED] ', '')}\n" for p in failed_paths)
+
+    lines.append("\n\n--- End of Report ---\n")
+    path_log_file_path.write_text(''.join(lines), encoding='utf-8')
 
-        f.write("\n\n--- End of Report ---\n")
-        
     return path_log_file_path
 
 def parse_args():
@@ -408,6 +1108,14 @@ def parse_args():
     parser.add_argument("--no-keep-plus", action="store_true", help="Replace '+' with '_' in category folder names.")
     parser.add_argument("--no-show-summary", action="store_true", help="Disable the final summary table.")
     parser.add_argument("--no-final-summary", action="store_true", help="Disable the final summary message.")
+    parser.add_argument("--partition", type=int, default=None, metavar="N",
+                        help="Use partition N (/pN) of the image instead of probing /p1-/p10 for Windows.")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="Number of categories to extract in parallel (default: 1, 0: choose from CPU count).")
+    parser.add_argument("--copy-threads", type=int, default=0, metavar="N",
+                        help="Copy file contents on N background threads while the search continues (default: 0, copy inline).")
+    parser.add_argument("--bundle", action="store_true",
+                        help="Store extracted files in one '<category>.tar' per category instead of individual files.")
     return parser.parse_args()
 
 
@@ -442,7 +1150,12 @@ def main():
 
     # 4. 결과 저장 디렉터리 생성
     program_output_dir = Path(args.OUTPUT_DIR) / llm_name_upper
-    program_output_dir.mkdir(parents=True, exist_ok=True)
+    CREATED_DIRECTORIES.clear() # 이전 실행의 기록은 신뢰할 수 없으므로 실행마다 새로 시작
+    ensure_directory(program_output_dir)
+    if args.bundle:
+        start_bundles(program_output_dir)
+    if args.copy_threads > 0:
+        start_copy_threads(args.copy_threads)
 
     # 5. 헤더 출력
     header_panel(args.E01_IMAGE_PATH, llm_name_upper, args.MODE, str(program_output_dir.resolve()))
@@ -452,12 +1165,14 @@ def main():
 
     # 6. 포렌식 이미지 열기
     console.print(f"[INFO] Opening image file: {args.E01_IMAGE_PATH}")
-    root_entry, _ = get_image_root_entry(e01_image_path)
+    root_entry, fs_path_spec = get_image_root_entry(e01_image_path, partition=args.partition, cache_dir=args.OUTPUT_DIR)
     if root_entry is None: sys.exit(1)
 
     console.print(f"[INFO] Starting artifact search for {len(artifacts_to_extract)} categories...")
 
-    collected_paths = {} # 추출된 경로를 저장할 딕셔너리
+    collected_paths = {} # 카테고리별로 추출된 경로를 저장할 딕셔너리 ({카테고리: {경로: None}})
+    worker_state = threading.local() # 병렬 추출 시 워커 스레드별 루트 엔트리
+    worker_contexts = [] # 워커 스레드가 연 dfVFS 리졸버 컨텍스트 (추출 종료 후 정리)
     
     # 7. 프로그레스 바와 함께 아티팩트 추출 실행
     with Progress(
@@ -470,50 +1185,85 @@ def main():
     ) as progress:
         task = progress.add_task("[yellow]Processing categories...", total=len(artifacts_to_extract))
 
-        # 각 카테고리(Program_Execution_Traces, Network 등) 별로 반복
+        # 각 카테고리(Program_Execution_Traces, Network 등)를 작업 목록으로 준비
+        jobs = []
         for category, artifacts in artifacts_to_extract.items():
             category_key = category if not args.no_keep_plus else category.replace('+', '_')
-            path_category_key = Path(category_key)
-            label = category_key.replace('_', ' ')
-            
-            progress.update(task, description=f"[yellow]Processing: {label}...")
-            
-            collected_paths[category_key] = []
-            
-            # 각 카테고리 내의 아티팩트 경로별로 반복
-            for artifact_info in artifacts:
-                full_path = artifact_info["path"]
-                if is_heuristic_mode: # 휴리스틱 모드 시 경로의 {LLM_NAME}을 실제 이름으로 치환
-                    full_path = full_path.replace("{LLM_NAME}", llm_name_upper)
-                    artifact_info["llm_name_placeholder"] = llm_name_upper
-                
-                path_parts = normalize_path(full_path).split('/')
-                counter = {'count': 0}
-                # 재귀 탐색 및 추출 함수 호출
-                recursive_search_and_extract(
-                    root_entry, path_parts, program_output_dir,
-                    path_category_key, [], artifact_info,
-                    collected_paths, counter
-                )
-            
-            if IS_MOCK_MODE: time.sleep(0.5) # 목 모드 시 시각적 효과를 위한 딜레이
-            progress.update(task, advance=1)
-        
+            jobs.append((category_key, artifacts))
+            collected_paths[category_key] = {}
+
+        def worker_root():
+            """현재 워커 스레드의 루트 엔트리를 반환함. 스레드마다 처음 한 번만 이미지를 다시 엶."""
+            if not hasattr(worker_state, "root"):
+                worker_state.root, context = open_file_system_root(fs_path_spec)
+                if context is not None: worker_contexts.append(context)
+            return worker_state.root
+
+        def run_category(category_key, artifacts):
+            """워커 스레드에서 한 카테고리의 아티팩트를 모두 탐색·추출하고, 해당 카테고리의 경로 목록을 반환함.
+
+            워커용 파일 시스템 열기 등이 실패해도 예외를 올리지 않고 이 카테고리에 실패로 기록하므로,
+            다른 카테고리의 결과와 보고서 작성은 그대로 진행됨.
+            """
+            category_paths = {category_key: {}}
+            try:
+                trie = build_artifact_trie([(category_key, artifacts)], llm_name_upper if is_heuristic_mode else None)
+                search_and_extract(worker_root(), trie, program_output_dir, [], category_paths, {'count': 0})
+            except Exception as e:
+                error_message = f"[EXTRACTION_FAILED] Could not process category '{category_key}': {e}"
+                category_paths[category_key][error_message] = None
+            return category_paths[category_key]
+
+        # 워커 수: 0이면 CPU 수 기준으로 자동 결정하고, 카테고리 수보다 많은 스레드는 만들지 않음
+        workers = args.workers if args.workers > 0 else min(16, (os.cpu_count() or 1) * 2)
+        workers = max(1, min(workers, len(jobs)))
+        if workers == 1:
+            # 단일 워커: 모든 카테고리의 경로를 하나의 트리로 합쳐 파일 시스템을 한 번만 탐색
+            # (여러 카테고리가 공유하는 'Users/*/AppData/...' 같은 접두 경로도 한 번만 방문)
+            # 카테고리의 마지막 경로 탐색이 끝날 때마다 프로그레스 바를 한 칸씩 진행
+            progress.update(task, description=f"[yellow]Processing {len(jobs)} categories in a single pass...")
+            trie = build_artifact_trie(jobs, llm_name_upper if is_heuristic_mode else None)
+            search_and_extract(
+                root_entry, trie, program_output_dir, [], collected_paths, {'count': 0},
+                on_category_done=lambda category_key: progress.update(task, advance=1, description=f"[yellow]Finished: {category_key.replace('_', ' ')}")
+            )
+            progress.update(task, completed=len(jobs)) # 아티팩트 경로가 없는 카테고리까지 포함해 완료 처리
+        else:
+            # 다중 워커: 카테고리별로 스레드를 할당하고, 각 워커 스레드는 자신만의 루트 엔트리를 한 번 열어 재사용
+            progress.update(task, description=f"[yellow]Processing {len(jobs)} categories with {workers} workers...")
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(run_category, category_key, artifacts): category_key
+                    for category_key, artifacts in jobs
+                }
+                for future in as_completed(futures):
+                    category_key = futures[future]
+                    collected_paths[category_key] = future.result()
+                    progress.update(task, advance=1, description=f"[yellow]Finished: {category_key.replace('_', ' ')}")
+
+        if COPY_EXECUTOR is not None: # --copy-threads 모드: 남은 복사 작업 완료 대기 및 실패 기록
+            progress.update(task, description="[yellow]Waiting for file copies to finish...")
+            finish_copy_threads()
         progress.update(task, description="[green]Extraction complete!")
 
+    close_bundles() # --bundle 모드: tar 묶음을 닫고 manifest.json 기록
+    DIRECTORY_LISTING_CACHE.clear() # 탐색이 끝나면 캐시된 dfVFS 엔트리를 해제
+    for context in worker_contexts: # 모든 워커가 종료된 뒤 워커별 컨텍스트의 파일 시스템 핸들을 닫음
+        context.Empty()
+
     # 8. 중간 결과 출력
     console.print("[INFO] Extraction process finished. Finalizing results...")
     
-    for category_key in collected_paths.keys():
-        paths = collected_paths[category_key]
-        succeeded = sum(1 for p in paths if not str(p).startswith("[EXTRACTION_FAILED]"))
-        failed = len(paths) - succeeded
+    # 카테고리별 성공/실패 개수는 한 번만 계산해 로그 작성과 최종 요약에 그대로 전달
+    # 카테고리별 결과 줄은 모아서 console.print 한 번으로 출력 (줄마다 rich 렌더링을 반복하지 않음)
+    category_counts = count_collected_paths(collected_paths)
+    result_lines = []
+    for category_key, (succeeded, failed) in category_counts.items():
         label = category_key.replace('_', ' ')
-        
-        if failed > 0:
-            console.print(f"[red][ALERT][/red] {label}: {succeeded} extracted, {failed} failed")
-        else:
-            console.print(f"[green][INFO][/green] {label}: {succeeded} extracted, {failed} failed")
+        status = "[red][ALERT][/red]" if failed > 0 else "[green][INFO][/green]"
+        result_lines.append(f"{status} {label}: {succeeded} extracted, {failed} failed")
+    if result_lines:
+        console.print("\n".join(result_lines))
 
     # 9. 상세 로그 파일 작성
     path_log_file_path = write_extracted_paths_log(
@@ -522,7 +1272,8 @@ def main():
         image_name=e01_image_path.name,
         llm_name=llm_name_upper,
         mode=args.MODE,
-        keep_plus=not args.no_keep_plus
+        keep_plus=not args.no_keep_plus,
+        category_counts=category_counts
     )
     
     # 10. 최종 요약 정보 출력
@@ -533,7 +1284,8 @@ def main():
         path_log_file_path=path_log_file_path,
         keep_plus=not args.no_keep_plus,
         show_table=not args.no_show_summary,
-        show_final_summary=not args.no_final_summary
+        show_final_summary=not args.no_final_summary,
+        category_counts=category_counts
     )
 
 